@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Callable, NoReturn
+from typing import Any, Callable, NoReturn, cast
 
 from django.core import checks, exceptions
 from django.db import models
@@ -8,11 +8,29 @@ from django.db.models.fields import NOT_PROVIDED, CharField
 from django.utils.translation import gettext_lazy as _
 
 
+class PrefixedDefault:
+    """Callable field default which prepends a prefix to the wrapped default."""
+
+    __slots__ = ("default", "prefix", "value")
+
+    def __init__(self, default: Callable | str, *, prefix: str) -> None:
+        self.default = default
+        self.prefix = prefix
+        # A literal default always produces the same value; build it once.
+        # None marks "not precomputed": a literal's value is a (possibly
+        # empty) string, so it can never be None.
+        self.value = None if callable(default) else prefix + str(default)
+
+    def __call__(self) -> str:
+        if self.value is not None:
+            return self.value
+        # Only callable defaults reach here. Generators such as ulid or ksuid
+        # return objects rather than str, so coerce the result.
+        return self.prefix + str(cast(Callable, self.default)())
+
+
 def prefixed_default(default: Callable | str, *, prefix: str) -> Callable:
-    if callable(default):
-        return lambda: f"{prefix}{default()}"
-    else:
-        return lambda: f"{prefix}{default}"
+    return PrefixedDefault(default, prefix=prefix)
 
 
 class CharIDField(CharField):
@@ -50,6 +68,13 @@ class CharIDField(CharField):
     def get_internal_type(self) -> str:
         return "CharField"
 
+    def get_prep_value(self, value: Any) -> Any:
+        # Plain strings are already prepared, so skip the CharField round
+        # trip through Field.get_prep_value and to_python for them.
+        if type(value) is str:
+            return value
+        return super().get_prep_value(value)
+
     def deconstruct(
         self,
     ) -> tuple[str, str, list, dict]:
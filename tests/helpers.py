@@ -1,9 +1,11 @@
+import itertools
 import re
 import time
+from functools import lru_cache
 
 ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
 
-COUNTER = 0
+_next_counter = itertools.count(1).__next__
 
 TEST_UID_REGEX = re.compile(r"[a-z_]{0,8}_?[a-z0-9]{8,20}")
 
@@ -13,12 +15,21 @@ def _to_base36(number: int) -> str:
     if number < 0:
         raise ValueError("Cannot encode negative numbers")
 
-    chars = ""
+    if number == 0:
+        return "0"
+
+    chars = []
     while number != 0:
         number, i = divmod(number, 36)  # 36-character alphabet
-        chars = ALPHABET[i] + chars
+        chars.append(ALPHABET[i])
+
+    return "".join(reversed(chars))
+
 
-    return chars or "0"
+@lru_cache(maxsize=1)
+def _millis_to_base36(millis: int) -> str:
+    """Encode a timestamp, reusing the result for calls in the same ms."""
+    return _to_base36(millis)
 
 
 def generate_test_uid(prefix=""):
@@ -30,7 +41,6 @@ def generate_test_uid(prefix=""):
     setting. Instead use a proper spec like cuid, ksuid or ulid.
 
     """
-    global COUNTER
-    COUNTER += 1
+    counter = _next_counter()
     millis = int(time.time() * 1000)
-    return prefix + _to_base36(millis) + _to_base36(COUNTER)
+    return prefix + _millis_to_base36(millis) + _to_base36(counter)
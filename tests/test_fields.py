@@ -1,15 +1,45 @@
 import json
+import uuid
+from enum import Enum
 from io import StringIO
 
 import pytest
+from django.core import serializers
 from django.core.management import call_command
+from django.db.models import Count, Q
 from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.safestring import mark_safe
+
+from charidfield import CharIDField
+from charidfield.fields import prefixed_default
 
 from .helpers import TEST_UID_REGEX, generate_test_uid
 from .models import IDModel, RelatedIDModel
 
 
+class Prefix(str, Enum):
+    DOG = "dog_"
+
+
+# Fields (and the name to look them up by) that identify a single row.
+LOOKUP_FIELDS = (
+    ("id", "id"),
+    ("id", "pk"),
+    ("default_id", "default_id"),
+    ("prefixed_id", "prefixed_id"),
+    ("no_index_id", "no_index_id"),
+)
+
+# Non-primary key fields which can be reassigned and saved.
+SETTABLE_FIELDS = (
+    "default_id",
+    "prefixed_id",
+    "null_id_with_no_default",
+    "no_index_id",
+)
+
+
 @pytest.mark.django_db
 class TestIDModel:
     def setup_method(self):
@@ -29,19 +59,19 @@ class TestIDModel:
         assert isinstance(self.instance_a.no_index_id, str)
         assert isinstance(self.instance_a.prefixed_and_non_callable_default_id, str)
 
-        assert TEST_UID_REGEX.match(self.instance_a.id)
-        assert TEST_UID_REGEX.match(self.instance_a.default_id)
-        assert TEST_UID_REGEX.match(self.instance_a.prefixed_id)
-        assert TEST_UID_REGEX.match(self.instance_a.no_index_id)
+        assert TEST_UID_REGEX.fullmatch(self.instance_a.id)
+        assert TEST_UID_REGEX.fullmatch(self.instance_a.default_id)
+        assert TEST_UID_REGEX.fullmatch(self.instance_a.prefixed_id)
+        assert TEST_UID_REGEX.fullmatch(self.instance_a.no_index_id)
 
         assert self.instance_a.prefixed_id.startswith("dev_")
         assert self.instance_a.prefixed_and_non_callable_default_id == "test_abcde"
 
     def test_ordering_by_id(self):
-        asc_queryset = IDModel.objects.all().order_by("id")
-        assert list(asc_queryset) == [self.instance_a, self.instance_b]
-        desc_queryset = IDModel.objects.all().order_by("-id")
-        assert list(desc_queryset) == [self.instance_b, self.instance_a]
+        asc_queryset = IDModel.objects.order_by("id").values_list("pk", flat=True)
+        assert list(asc_queryset) == [self.instance_a.pk, self.instance_b.pk]
+        desc_queryset = IDModel.objects.order_by("-id").values_list("pk", flat=True)
+        assert list(desc_queryset) == [self.instance_b.pk, self.instance_a.pk]
 
     def test_no_collision_amongst_same_model_fields(self):
         # This is obviously not a collision-resistance test; but rather
@@ -61,73 +91,74 @@ class TestIDModel:
             == 6
         )
 
-    @pytest.mark.parametrize(
-        "model_field_name, lookup_field_name",
-        (
-            ("id", "id"),
-            ("id", "pk"),
-            ("default_id", "default_id"),
-            ("prefixed_id", "prefixed_id"),
-            ("no_index_id", "no_index_id"),
-        ),
-    )
-    def test_get_lookup(self, model_field_name, lookup_field_name):
+    @pytest.mark.parametrize("model_field_name, lookup_field_name", LOOKUP_FIELDS)
+    def test_get_lookup(
+        self, model_field_name, lookup_field_name, django_assert_num_queries
+    ):
         lookup_value = getattr(self.instance_a, model_field_name)
 
-        # Test QuerySet.get
-        lookup_filter = {lookup_field_name: lookup_value}
-        instance = IDModel.objects.get(**lookup_filter)
-        assert instance == self.instance_a
-
-        # Test QuerySet.filter exact (implicit)
-        lookup_filter = {lookup_field_name: lookup_value}
-        queryset = IDModel.objects.filter(**lookup_filter)
-        assert list(queryset) == [self.instance_a]
-
-        # Test QuerySet.filter exact (explicit)
-        lookup_filter = {f"{lookup_field_name}__exact": lookup_value}
-        queryset = IDModel.objects.filter(**lookup_filter)
-        assert list(queryset) == [self.instance_a]
-
-        # Test QuerySet.filter iexact
-        lookup_filter = {f"{lookup_field_name}__iexact": lookup_value}
-        queryset = IDModel.objects.filter(**lookup_filter)
-        assert list(queryset) == [self.instance_a]
-
-        # Test QuerySet.filter contains
-        lookup_filter = {f"{lookup_field_name}__contains": lookup_value}
-        queryset = IDModel.objects.filter(**lookup_filter)
-        assert list(queryset) == [self.instance_a]
-
-        # Test QuerySet.filter icontains
-        lookup_filter = {f"{lookup_field_name}__icontains": lookup_value}
-        queryset = IDModel.objects.filter(**lookup_filter)
-        assert list(queryset) == [self.instance_a]
-
-        # Test Queryset.filter __in
-        lookup_filter = {f"{lookup_field_name}__in": [lookup_value]}
-        queryset = IDModel.objects.filter(**lookup_filter)
-        assert list(queryset) == [self.instance_a]
+        # Each lookup is its own round trip; pin the count so a change in how
+        # the field prepares values can't quietly add queries.
+        with django_assert_num_queries(7):
+            # Test QuerySet.get
+            lookup_filter = {lookup_field_name: lookup_value}
+            instance = IDModel.objects.get(**lookup_filter)
+            assert instance == self.instance_a
+
+            # Test QuerySet.filter exact (implicit)
+            lookup_filter = {lookup_field_name: lookup_value}
+            queryset = IDModel.objects.filter(**lookup_filter)
+            assert list(queryset.values_list("pk", flat=True)) == [self.instance_a.pk]
+
+            # Test QuerySet.filter exact (explicit)
+            lookup_filter = {f"{lookup_field_name}__exact": lookup_value}
+            queryset = IDModel.objects.filter(**lookup_filter)
+            assert list(queryset.values_list("pk", flat=True)) == [self.instance_a.pk]
+
+            # Test QuerySet.filter iexact
+            lookup_filter = {f"{lookup_field_name}__iexact": lookup_value}
+            queryset = IDModel.objects.filter(**lookup_filter)
+            assert list(queryset.values_list("pk", flat=True)) == [self.instance_a.pk]
+
+            # Test QuerySet.filter contains
+            lookup_filter = {f"{lookup_field_name}__contains": lookup_value}
+            queryset = IDModel.objects.filter(**lookup_filter)
+            assert list(queryset.values_list("pk", flat=True)) == [self.instance_a.pk]
+
+            # Test QuerySet.filter icontains
+            lookup_filter = {f"{lookup_field_name}__icontains": lookup_value}
+            queryset = IDModel.objects.filter(**lookup_filter)
+            assert list(queryset.values_list("pk", flat=True)) == [self.instance_a.pk]
+
+            # Test Queryset.filter __in
+            lookup_filter = {f"{lookup_field_name}__in": [lookup_value]}
+            queryset = IDModel.objects.filter(**lookup_filter)
+            assert list(queryset.values_list("pk", flat=True)) == [self.instance_a.pk]
 
     def test_lookups__with_empty_string(self):
         qs = IDModel.objects.filter(not_null_id_but_blank="")
-        assert list(qs) == [self.instance_a, self.instance_b]
+        pks = list(qs.values_list("pk", flat=True))
+        assert pks == [self.instance_a.pk, self.instance_b.pk]
 
     def test_lookups__with_none(self):
         qs = IDModel.objects.filter(null_id_with_no_default=None)
-        assert list(qs) == [self.instance_a, self.instance_b]
+        pks = list(qs.values_list("pk", flat=True))
+        assert pks == [self.instance_a.pk, self.instance_b.pk]
 
     def test_lookups__subqueries(self):
-        a = IDModel.objects.create(name="Record A")
-        b = IDModel.objects.create(name="Record B")
-        IDModel.objects.create(name="Record C")
-        queryset = IDModel.objects.filter(name__icontains="Record").order_by("name")[:2]
-        assert len(queryset) == 2
-        assert list(queryset) == [a, b]
+        a, b, _ = IDModel.objects.bulk_create(
+            [
+                IDModel(name="Record A"),
+                IDModel(name="Record B"),
+                IDModel(name="Record C"),
+            ]
+        )
+        records = IDModel.objects.filter(name__startswith="Record")
+        queryset = records.order_by("name")[:2]
+        assert list(queryset.values_list("pk", flat=True)) == [a.pk, b.pk]
 
         subquery_lookup = IDModel.objects.filter(id__in=queryset.values("id"))
-        assert len(subquery_lookup) == 2
-        assert list(subquery_lookup) == [a, b]
+        assert list(subquery_lookup.values_list("pk", flat=True)) == [a.pk, b.pk]
 
     def test_lookups__values(self):
         values_qs = IDModel.objects.values("id")
@@ -144,26 +175,33 @@ class TestIDModel:
         ]
 
     def test_lookups__isnull(self):
-        assert IDModel.objects.filter(null_id_with_no_default__isnull=True).count() == 2
-        assert IDModel.objects.filter(id__isnull=False).count() == 2
+        counts = IDModel.objects.aggregate(
+            null_ids=Count("pk", filter=Q(null_id_with_no_default__isnull=True)),
+            non_null_ids=Count("pk", filter=Q(id__isnull=False)),
+        )
+        assert counts == {"null_ids": 2, "non_null_ids": 2}
 
     def test_lookups__gt_lt(self):
-        a = IDModel.objects.create(name="Record A")
-        b = IDModel.objects.create(name="Record B")
-        c = IDModel.objects.create(name="Record C")
-        base_queryset = IDModel.objects.filter(name__icontains="Record")
+        a, b, c = IDModel.objects.bulk_create(
+            [
+                IDModel(name="Record A"),
+                IDModel(name="Record B"),
+                IDModel(name="Record C"),
+            ]
+        )
+        base_queryset = IDModel.objects.filter(name__startswith="Record")
 
         gt_queryset = base_queryset.filter(id__gt=b.id).order_by("id")
-        assert list(gt_queryset) == [c]
+        assert list(gt_queryset.values_list("pk", flat=True)) == [c.pk]
 
         lt_queryset = base_queryset.filter(id__lt=b.id).order_by("id")
-        assert list(lt_queryset) == [a]
+        assert list(lt_queryset.values_list("pk", flat=True)) == [a.pk]
 
         gte_queryset = base_queryset.filter(id__gte=b.id).order_by("id")
-        assert list(gte_queryset) == [b, c]
+        assert list(gte_queryset.values_list("pk", flat=True)) == [b.pk, c.pk]
 
         lte_queryset = base_queryset.filter(id__lte=b.id).order_by("id")
-        assert list(lte_queryset) == [a, b]
+        assert list(lte_queryset.values_list("pk", flat=True)) == [a.pk, b.pk]
 
     def test_get_or_create(self):
         instance, created = IDModel.objects.get_or_create(name="Instance A")
@@ -208,20 +246,9 @@ class TestIDModel:
         self.instance_a.default_id = generate_test_uid()
         self.instance_a.prefixed_id = generate_test_uid(prefix="dev_")
         self.instance_a.save()
-        self.instance_a.refresh_from_db()
-        assert self.instance_a.id == new_id
-        assert IDModel.objects.filter(id=old_id).count() == 1
-        assert IDModel.objects.filter(id=new_id).count() == 1
+        assert IDModel.objects.filter(id__in=[old_id, new_id]).count() == 2
 
-    @pytest.mark.parametrize(
-        "model_field_name",
-        (
-            "default_id",
-            "prefixed_id",
-            "null_id_with_no_default",
-            "no_index_id",
-        ),
-    )
+    @pytest.mark.parametrize("model_field_name", SETTABLE_FIELDS)
     def test_setting_non_primary_key(self, model_field_name):
         old_id = getattr(self.instance_a, model_field_name)
         field = self.instance_a._meta.get_field(model_field_name)
@@ -235,32 +262,43 @@ class TestIDModel:
         # Test persistance & retrieval; because we are settings non-primary key
         # values we would expect the mutation to occur on the existing entity.
         self.instance_a.save()
-        self.instance_a.refresh_from_db()
+        self.instance_a.refresh_from_db(fields=[model_field_name])
         assert getattr(self.instance_a, model_field_name) == new_id
         assert IDModel.objects.filter(**{model_field_name: new_id}).count() == 1
         if old_id:
-            assert IDModel.objects.filter(**{model_field_name: old_id}).count() == 0
+            assert not IDModel.objects.filter(**{model_field_name: old_id}).exists()
 
-    def test_foreign_key__with_parent_model__instance(self):
+    def test_foreign_key__with_parent_model__instance(self, django_assert_num_queries):
         related_instance = RelatedIDModel.objects.create(
             name="Blue Album", parent=self.instance_a
         )
         assert isinstance(related_instance, RelatedIDModel)
         assert related_instance.parent == self.instance_a
-        assert RelatedIDModel.objects.get(parent=self.instance_a) == related_instance
 
-    def test_foreign_key__with_parent_model__string(self):
+        # The parent should be joined by its char-based key in one query.
+        queryset = RelatedIDModel.objects.select_related("parent")
+        with django_assert_num_queries(1):
+            fetched_instance = queryset.get(parent=self.instance_a)
+            assert fetched_instance == related_instance
+            assert fetched_instance.parent == self.instance_a
+
+    def test_foreign_key__with_parent_model__string(self, django_assert_num_queries):
         related_instance = RelatedIDModel.objects.create(
             name="Blue Album", parent_id=self.instance_a.id
         )
         assert isinstance(related_instance, RelatedIDModel)
         assert related_instance.parent == self.instance_a
-        assert RelatedIDModel.objects.get(parent=self.instance_a.id) == related_instance
 
-    def test_dumpdata(self):
-        out = StringIO()
-        call_command("dumpdata", "tests.IDModel", stdout=out)
-        output_json = out.getvalue()
+        # The parent should be joined by its char-based key in one query.
+        queryset = RelatedIDModel.objects.select_related("parent")
+        with django_assert_num_queries(1):
+            fetched_instance = queryset.get(parent=self.instance_a.id)
+            assert fetched_instance == related_instance
+            assert fetched_instance.parent == self.instance_a
+
+    def test_dumpdata(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            output_json = serializers.serialize("json", IDModel.objects.order_by("pk"))
         output = json.loads(output_json)
 
         assert output == [
@@ -296,7 +334,28 @@ class TestIDModel:
         out = StringIO()
         call_command("loaddata", "idmodels", stdout=out)
         assert out.getvalue().strip() == "Installed 2 object(s) from 1 fixture(s)"
-        instance_a = IDModel.objects.get(pk="ckp6tebm500001k685ppzonod")
-        instance_b = IDModel.objects.get(pk="ckp6tebm600061k68mrl86aei")
-        assert instance_a.name == "Instance A"
-        assert instance_b.name == "Instance B"
+        instances = IDModel.objects.in_bulk(
+            ["ckp6tebm500001k685ppzonod", "ckp6tebm600061k68mrl86aei"]
+        )
+        assert instances["ckp6tebm500001k685ppzonod"].name == "Instance A"
+        assert instances["ckp6tebm600061k68mrl86aei"].name == "Instance B"
+
+
+class TestPrefixedDefault:
+    def test_callable_default__non_str_return_value(self):
+        default = prefixed_default(uuid.uuid4, prefix="dev_")()
+        assert default.startswith("dev_")
+        assert uuid.UUID(default[len("dev_") :])
+
+    def test_literal_default__non_str_value(self):
+        assert prefixed_default(123, prefix="dev_")() == "dev_123"
+
+
+class TestCharIDField:
+    @pytest.mark.parametrize(
+        "prefix", (Prefix.DOG, mark_safe("dog_")), ids=("str_enum", "safe_string")
+    )
+    def test_prefix__str_subclass(self, prefix):
+        field = CharIDField(prefix=prefix, default=generate_test_uid, max_length=30)
+        assert field.prefix == "dog_"
+        assert field.get_default().startswith("dog_")
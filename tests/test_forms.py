@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+from typing import ClassVar
+
 import pytest
 
 from .forms import NullableIDForm, PrefixedIDForm
@@ -6,6 +10,12 @@ from .models import IDModel
 
 @pytest.mark.django_db
 class TestPrefixedIDForm:
+    # Valid submission data; tests override keys as needed.
+    _BASE_DATA: ClassVar[dict[str, str]] = {
+        "name": "Instance A",
+        "prefixed_id": "dev_ckp6tebm500001k685ppzonod",
+    }
+
     def test_initial__without_instance(self):
         form = PrefixedIDForm()
         assert form["prefixed_id"].value().startswith("dev_")
@@ -21,12 +31,7 @@ class TestPrefixedIDForm:
 
     def test_create_success(self):
         assert IDModel.objects.exists() is False
-        form = PrefixedIDForm(
-            {
-                "name": "Instance A",
-                "prefixed_id": "dev_ckp6tebm500001k685ppzonod",
-            },
-        )
+        form = PrefixedIDForm(self._BASE_DATA)
         assert form.is_valid() is True, form.errors
         instance = form.save()
         assert instance.prefixed_id == "dev_ckp6tebm500001k685ppzonod"
@@ -40,25 +45,17 @@ class TestPrefixedIDForm:
             prefixed_id="dev_ckpd1rrim000001jm8iijh07p",
         )
         form = PrefixedIDForm(
-            {
-                "name": "Instance A - Edit",
-                "prefixed_id": "dev_ckp6tebm500001k685ppzonod",
-            },
-            instance=instance_a,
+            {**self._BASE_DATA, "name": "Instance A - Edit"}, instance=instance_a
         )
         assert form.is_valid() is True, form.errors
         instance = form.save()
-        instance.refresh_from_db()
+        instance.refresh_from_db(fields=["name", "prefixed_id"])
         assert instance.id == instance_a.id
         assert instance.prefixed_id == "dev_ckp6tebm500001k685ppzonod"
         assert instance.name == "Instance A - Edit"
 
     def test_missing_field(self):
-        form = PrefixedIDForm(
-            {
-                "name": "Instance A",
-            },
-        )
+        form = PrefixedIDForm({"name": "Instance A"})
         assert form.is_valid() is False
         assert len(form.errors) == 1
         assert "prefixed_id" in form.errors
@@ -67,10 +64,7 @@ class TestPrefixedIDForm:
 
     def test_invalid_prefix(self):
         form = PrefixedIDForm(
-            {
-                "name": "Instance A",
-                "prefixed_id": "cus_ckp6tebm500001k685ppzonod",
-            },
+            {**self._BASE_DATA, "prefixed_id": "cus_ckp6tebm500001k685ppzonod"}
         )
         assert form.is_valid() is False
         assert len(form.errors) == 1
@@ -79,9 +73,7 @@ class TestPrefixedIDForm:
         assert "requires the prefix “dev_”." in form.errors["prefixed_id"][0]
 
     def test_field_has_no_required_value(self):
-        form = PrefixedIDForm(
-            {"name": "Instance A", "prefixed_id": None},
-        )
+        form = PrefixedIDForm({**self._BASE_DATA, "prefixed_id": None})
         assert form.is_valid() is False
         assert len(form.errors) == 1
         assert "prefixed_id" in form.errors
@@ -95,5 +87,5 @@ class TestNullableIDForm:
         form = NullableIDForm({"name": "Instance A"})
         assert form.is_valid()
         instance = form.save()
-        instance.refresh_from_db()
+        instance.refresh_from_db(fields=["null_id_with_no_default"])
         assert instance.null_id_with_no_default is None